@@ -1,25 +1,121 @@
-import collections
+import functools
+import hashlib
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import attr
-import tatsu
-from tatsu.exceptions import FailedToken
+from ics.types import ContainerItem
 
-from ics.types import ContainerItem, RuntimeAttrValidation
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # only needed when compiling this module with mypyc, see setup.py
+    def mypyc_attr(*attrs, **kwattrs):  # type: ignore
+        return lambda cls: cls
 
 grammar_path = Path(__file__).parent.joinpath('contentline.ebnf')
 
-with open(grammar_path) as fd:
-    GRAMMAR = tatsu.compile(fd.read())
+
+def _env_flag(name: str) -> bool:
+    """Whether the environment variable `name` is set to a true value like 1, true or yes"""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes")
+
+
+# The TatSu grammar is only used as a fallback for the hand-written scanner below
+USE_TATSU = _env_flag("ICS_USE_TATSU")
+
+
+@functools.lru_cache(maxsize=1)
+def _grammar():
+    """Compile the TatSu grammar on first use, so that importing ics doesn't pay for it"""
+    import tatsu
+    with open(grammar_path) as fd:
+        return tatsu.compile(fd.read())
+
+
+# Character classes of the terminals in contentline.ebnf
+_NAME = re.compile(r"[a-zA-Z0-9\-]+")
+_QSAFE_CHARS = re.compile(r"[^\x00-\x08\x0A-\x1F\x22\x7F]*")
+_SAFE_CHARS = re.compile(r"[^\x00-\x08\x0A-\x1F\x22\x2C\x3A\x3B\x7F]*")
+_VALUE_CHARS = re.compile(r"[^\x00-\x08\x0A-\x1F\x7F]*")
+
+# The line breaks of iCalendar text. Unlike str.splitlines, other characters like "\x85" or "\u2028"
+# don't end a line but are kept as part of the value.
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+# Once blank lines are removed, a line starting with a space or tab continues the previous one
+_FOLDING = re.compile(r"\n[ \t]")
+
+# LRU cache of parsed lines, storing immutable (name, params, value) tuples as ContentLines are mutable
+_PARSE_CACHE: "OrderedDict[str, Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...], str]]" = OrderedDict()
+_PARSE_CACHE_SIZE = 4096
+_PARSE_CACHE_MAX_LINE_LENGTH = 512
+_PARSE_CACHE_LOCK = threading.Lock()
+
+# Opt-in LRU cache of whole parsed calendar strings, keyed on a hash of their content
+USE_STRING_CACHE = _env_flag("ICS_PARSE_CACHE")
+_STRING_CACHE: "OrderedDict[bytes, List[ContainerItem]]" = OrderedDict()
+_STRING_CACHE_SIZE = 16
+_STRING_CACHE_LOCK = threading.Lock()
 
 
 class ParseError(Exception):
     pass
 
 
-@attr.s(repr=False)
-class ContentLine(RuntimeAttrValidation):
+def _join_tokens(tokens: Any) -> str:
+    # TatSu already returns the regex terminals as strings, joining those would only copy them char by char
+    if isinstance(tokens, str):
+        return tokens
+    return ''.join(tokens)
+
+
+def _parse_contentline(line: str) -> Tuple[str, Dict[str, List[str]], str]:
+    """Split an unfolded line into its name, parameters and value.
+
+    This is a hand-written scanner accepting the same language as the
+    ``contentline`` rule of ``contentline.ebnf``.
+    """
+    match = _NAME.match(line)
+    if match is None:
+        raise ParseError("Expected a name at the start of {!r}".format(line))
+    name = match.group()
+    pos = match.end()
+
+    params: Dict[str, List[str]] = {}
+    while line.startswith(";", pos):
+        match = _NAME.match(line, pos + 1)
+        if match is None or not line.startswith("=", match.end()):
+            raise ParseError("Expected a parameter at position {} of {!r}".format(pos + 1, line))
+        param_name = sys.intern(match.group())
+        param_values = []
+        pos = match.end()
+        while True:  # line[pos] is either the "=" or a "," separating values
+            pos += 1
+            if line.startswith('"', pos):
+                end = _QSAFE_CHARS.match(line, pos + 1).end()  # type: ignore
+                if not line.startswith('"', end):
+                    raise ParseError("Unterminated quoted value at position {} of {!r}".format(pos, line))
+                param_values.append(line[pos + 1:end])
+                pos = end + 1
+            else:
+                end = _SAFE_CHARS.match(line, pos).end()  # type: ignore
+                param_values.append(line[pos:end])
+                pos = end
+            if not line.startswith(",", pos):
+                break
+        params[param_name] = param_values
+
+    if not line.startswith(":", pos):
+        raise ParseError("Expected ':' at position {} of {!r}".format(pos, line))
+    if _VALUE_CHARS.match(line, pos + 1).end() != len(line):  # type: ignore
+        raise ParseError("Invalid character in the value of {!r}".format(line))
+    return name, params, line[pos + 1:]
+
+
+class ContentLine(object):
     """
     Represents one property line.
 
@@ -30,15 +126,33 @@ class ContentLine(RuntimeAttrValidation):
     ``ContentLine('FOO', {'BAR': ['1']}, 'YOLO'))``
     """
 
-    name: str = attr.ib(converter=str.upper)  # type: ignore
-    params: Dict[str, List[str]] = attr.ib(factory=dict)
-    value: str = attr.ib(default="")
+    __slots__ = ("name", "params", "value")
+
+    name: str
+    params: Dict[str, List[str]]
+    value: str
+
+    def __init__(self, name: str, params: Optional[Dict[str, List[str]]] = None, value: str = ""):
+        self.name = sys.intern(name.upper())
+        self.params = {} if params is None else params
+        self.value = value
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.params, self.value)
 
-    def __str__(self):
-        params_str = ''
-        for pname in self.params:
-            params_str += ';{}={}'.format(pname, ','.join(self.params[pname]))  # TODO ensure escaping?
-        return "{}{}:{}".format(self.name, params_str, self.value)
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.name, self.params, self.value) == (other.name, other.params, other.value)
+
+    def __str__(self) -> str:
+        if not self.params:
+            return f"{self.name}:{self.value}"
+        params_str = ''.join([
+            ';' + pname + '=' + ','.join(pvalues)  # TODO ensure escaping?
+            for pname, pvalues in self.params.items()
+        ])
+        return f"{self.name}{params_str}:{self.value}"
 
     def __repr__(self):
         return "<ContentLine '{}' with {} parameter{}. Value='{}'>".format(
@@ -55,33 +169,60 @@ class ContentLine(RuntimeAttrValidation):
         self.params[item] = list(values)
 
     @classmethod
-    def parse(cls, line):
+    def parse(cls, line: str) -> "ContentLine":
         """Parse a single iCalendar-formatted line into a ContentLine"""
         if "\n" in line or "\r" in line:
             raise ValueError("ContentLine can only contain escaped newlines")
-        try:
-            ast = GRAMMAR.parse(line)
-        except FailedToken:
-            raise ParseError()
+
+        # Most lines have no parameters, for those splitting at the first colon is enough
+        colon = line.find(":")
+        semicolon = line.find(";")
+        if 0 < colon and (semicolon < 0 or semicolon > colon) and _NAME.fullmatch(line, 0, colon) \
+                and _VALUE_CHARS.match(line, colon + 1).end() == len(line):  # type: ignore
+            return cls(line[:colon], {}, line[colon + 1:])
+
+        with _PARSE_CACHE_LOCK:
+            cached = _PARSE_CACHE.get(line)
+            if cached is not None:
+                _PARSE_CACHE.move_to_end(line)
+        if cached is not None:
+            name, params, value = cached
+            return cls(name, {pname: list(pvalues) for pname, pvalues in params}, value)
+
+        if not USE_TATSU:
+            content_line = cls(*_parse_contentline(line))
         else:
-            return cls.interpret_ast(ast)
+            from tatsu.exceptions import FailedParse
+            try:
+                ast = _grammar().parse(line)
+            except FailedParse:
+                raise ParseError()
+            content_line = cls.interpret_ast(ast)
+
+        if len(line) <= _PARSE_CACHE_MAX_LINE_LENGTH:
+            frozen_params = tuple((pname, tuple(pvalues)) for pname, pvalues in content_line.params.items())
+            with _PARSE_CACHE_LOCK:
+                _PARSE_CACHE[line] = (content_line.name, frozen_params, content_line.value)
+                if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                    _PARSE_CACHE.popitem(last=False)
+        return content_line
 
     @classmethod
-    def interpret_ast(cls, ast):
-        name = ''.join(ast['name'])
-        value = ''.join(ast['value'])
-        params = {}
-        for param_ast in ast.get('params', []):
-            param_name = ''.join(param_ast["name"])
-            param_values = [''.join(x) for x in param_ast["values_"]]
-            params[param_name] = param_values
+    def interpret_ast(cls, ast: Any) -> "ContentLine":
+        name = _join_tokens(ast['name'])
+        value = _join_tokens(ast['value'])
+        params = {
+            sys.intern(_join_tokens(param_ast["name"])): [_join_tokens(x) for x in param_ast["values_"]]
+            for param_ast in ast.get('params', ())
+        }
         return cls(name, params, value)
 
-    def clone(self):
+    def clone(self) -> "ContentLine":
         """Makes a copy of itself"""
-        return attr.evolve(self)
+        return self.__class__(self.name, dict(self.params), self.value)
 
 
+@mypyc_attr(native_class=False)  # mypyc can't compile subclasses of list to native classes
 class Container(List[ContainerItem]):
     """Represents an iCalendar object.
     Contains a list of ContentLines or Containers.
@@ -93,68 +234,106 @@ class Container(List[ContainerItem]):
     """
 
     def __init__(self, name: str, *items: ContainerItem):
-        self.check_items(*items)
-        super(Container, self).__init__(items)
+        self._check_item_list(items)
+        list.__init__(self, items)
         self.name = name
 
-    def __str__(self):
-        name = self.name
-        ret = ['BEGIN:' + name]
+    @classmethod
+    def from_iterable(cls, name: str, items: Iterable[ContainerItem]) -> "Container":
+        """Creates a Container from any iterable of items, without spreading them into varargs"""
+        items = list(items)
+        cls._check_item_list(items)
+        return cls._from_items_unchecked(name, items)
+
+    def __str__(self) -> str:
+        return "\r\n".join(self._iter_lines())
+
+    def _iter_lines(self) -> Iterator[str]:
+        """Yields the lines of this Container and all nested Containers, so that they can be joined only once"""
+        yield 'BEGIN:' + self.name
         for line in self:
-            ret.append(str(line))
-        ret.append('END:' + name)
-        return "\r\n".join(ret)
+            if isinstance(line, Container):
+                yield from line._iter_lines()
+            else:
+                yield str(line)
+        yield 'END:' + self.name
 
     def __repr__(self):
         return "<Container '{}' with {} element{}>" \
             .format(self.name, len(self), "s" if len(self) > 1 else "")
 
     @classmethod
-    def parse(cls, name, tokenized_lines):
-        items = []
+    def _from_items_unchecked(cls, name: str, items: List[ContainerItem]) -> "Container":
+        """Creates a Container directly from a list of items already known to be valid"""
+        container = cls.__new__(cls)
+        list.__init__(container, items)
+        container.name = name
+        return container
+
+    @classmethod
+    def parse(cls, name: str, tokenized_lines: Iterator[ContentLine]) -> "Container":
+        # Nested blocks are handled with an explicit stack instead of recursion, so that deeply nested
+        # input can't exhaust the interpreter stack. It holds the name and items of all enclosing blocks.
+        stack: List[Tuple[str, List[ContainerItem]]] = []
+        items: List[ContainerItem] = []
         for line in tokenized_lines:
             if line.name == 'BEGIN':
-                items.append(cls.parse(line.value, tokenized_lines))
+                stack.append((name, items))
+                name, items = line.value, []
             elif line.name == 'END':
                 if line.value != name:
                     raise ParseError(
                         "Expected END:{}, got END:{}".format(name, line.value))
-                break
+                if not stack:
+                    break
+                container = cls._from_items_unchecked(name, items)
+                name, items = stack.pop()
+                items.append(container)
             else:
                 items.append(line)
-        return cls(name, *items)
+        while stack:  # the input ended before all blocks were closed
+            container = cls._from_items_unchecked(name, items)
+            name, items = stack.pop()
+            items.append(container)
+        return cls._from_items_unchecked(name, items)
 
-    def clone(self):
+    def clone(self) -> "Container":
         """Makes a copy of itself"""
-        return self.__class__(self.name, *self)
+        return self._from_items_unchecked(self.name, self)
 
     def check_items(self, *items):
-        from ics.utils import check_is_instance
-        if len(items) == 1:
-            check_is_instance("item", items[0], (ContentLine, Container))
-        else:
-            for nr, item in enumerate(items):
-                check_is_instance("item %s" % nr, item, (ContentLine, Container))
+        self._check_item_list(items)
+
+    @staticmethod
+    def _check_item_list(items):
+        for nr, item in enumerate(items):
+            if not isinstance(item, (ContentLine, Container)):
+                # only import when raising, ics.utils itself imports this module
+                from ics.utils import check_is_instance
+                check_is_instance("item %s" % nr if len(items) > 1 else "item", item, (ContentLine, Container))
 
     def __setitem__(self, index, value):
-        self.check_items(value)
-        super(Container, self).__setitem__(index, value)
+        if not isinstance(value, (ContentLine, Container)):
+            self.check_items(value)
+        list.__setitem__(self, index, value)
 
     def insert(self, index, value):
-        self.check_items(value)
-        super(Container, self).insert(index, value)
+        if not isinstance(value, (ContentLine, Container)):
+            self.check_items(value)
+        list.insert(self, index, value)
 
     def append(self, value):
-        self.check_items(value)
-        super(Container, self).append(value)
+        if not isinstance(value, (ContentLine, Container)):
+            self.check_items(value)
+        list.append(self, value)
 
     def extend(self, values):
-        self.check_items(*values)
-        super(Container, self).extend(values)
+        self._check_item_list(values)
+        list.extend(self, values)
 
     def __add__(self, values):
         container = type(self)(self.name)
-        container.extend(self)
+        list.extend(container, self)  # our own items were already checked
         container.extend(values)
         return container
 
@@ -163,50 +342,105 @@ class Container(List[ContainerItem]):
         return self
 
 
-def unfold_lines(physical_lines):
-    if not isinstance(physical_lines, collections.abc.Iterable):
+def unfold_lines(physical_lines: Iterable[str]) -> Iterator[str]:
+    """Joins folded lines back into logical lines, skipping blank lines.
+
+    The physical lines should not contain their "\\n" terminators any more, a trailing "\\r" is removed.
+    """
+    try:
+        lines = iter(physical_lines)
+    except TypeError:
         raise ParseError('Parameter `physical_lines` must be an iterable')
-    current_line = ''
-    for line in physical_lines:
-        if len(line.strip()) == 0:
+    parts: List[str] = []
+    for line in lines:
+        if not line or line.isspace():
             continue
-        elif not current_line:
-            current_line = line.strip('\r')
-        elif line[0] in (' ', '\t'):
-            current_line += line[1:].strip('\r')
+        elif parts and line[0] in (' ', '\t'):
+            parts.append(line[1:].rstrip('\r'))
         else:
-            yield current_line
-            current_line = line.strip('\r')
-    if current_line:
-        yield current_line
+            if parts:
+                yield ''.join(parts)
+            parts = [line.rstrip('\r')]
+    if parts:
+        yield ''.join(parts)
+
+
+def unfold_text(txt: str) -> List[str]:
+    """Unfold a whole iCalendar string at once and split it into its logical lines.
+
+    Gives the same lines as `unfold_lines` on the physical lines, but unfolds them with a single regex substitution.
+    """
+    lines = [line for line in _LINE_BREAK.split(txt) if line and not line.isspace()]
+    if not lines:
+        return []
+    return _FOLDING.sub('', '\n'.join(lines)).split('\n')
 
 
-def tokenize_line(unfolded_lines):
+def tokenize_line(unfolded_lines: Iterable[str]) -> Iterator[ContentLine]:
     for line in unfolded_lines:
         yield ContentLine.parse(line)
 
 
-def parse(tokenized_lines):
+def parse(tokenized_lines: Iterable[ContentLine]) -> List[ContainerItem]:
     # tokenized_lines must be an iterator, so that Container.parse can consume/steal lines
-    tokenized_lines = iter(tokenized_lines)
-    res = []
-    for line in tokenized_lines:
+    lines = iter(tokenized_lines)
+    res: List[ContainerItem] = []
+    for line in lines:
         if line.name == 'BEGIN':
-            res.append(Container.parse(line.value, tokenized_lines))
+            res.append(Container.parse(line.value, lines))
         else:
             res.append(line)
     return res
 
 
-def lines_to_container(lines):
+def lines_to_container(lines: Iterable[str]) -> List[ContainerItem]:
     return parse(tokenize_line(unfold_lines(lines)))
 
 
-def string_to_container(txt):
-    return lines_to_container(txt.splitlines())
+def string_to_container(txt: str) -> List[ContainerItem]:
+    return parse(tokenize_line(unfold_text(txt)))
+
+
+def _clone_line(line: ContentLine) -> ContentLine:
+    return line.__class__(line.name, {pname: list(pvalues) for pname, pvalues in line.params.items()}, line.value)
+
+
+def _deep_clone(item: ContainerItem) -> ContainerItem:
+    if not isinstance(item, Container):
+        return _clone_line(item)
+    # Like Container.parse, use an explicit stack so that deeply nested Containers can't exhaust the interpreter stack.
+    # It holds the Containers whose children still need to be copied, together with their (so far empty) copies.
+    clone = item._from_items_unchecked(item.name, [])
+    stack = [(item, clone)]
+    while stack:
+        original, copy = stack.pop()
+        for child in original:
+            child_copy: ContainerItem
+            if isinstance(child, Container):
+                child_copy = child._from_items_unchecked(child.name, [])
+                stack.append((child, child_copy))
+            else:
+                child_copy = _clone_line(child)
+            list.append(copy, child_copy)
+    return clone
 
 
-def calendar_string_to_containers(string):
+def calendar_string_to_containers(string: str) -> List[ContainerItem]:
     if not isinstance(string, str):
         raise TypeError("Expecting a string")
-    return string_to_container(string)
+    if not USE_STRING_CACHE:
+        return string_to_container(string)
+
+    key = hashlib.blake2b(string.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _STRING_CACHE_LOCK:
+        cached = _STRING_CACHE.get(key)
+        if cached is not None:
+            _STRING_CACHE.move_to_end(key)
+    if cached is None:
+        cached = string_to_container(string)
+        with _STRING_CACHE_LOCK:
+            _STRING_CACHE[key] = cached
+            if len(_STRING_CACHE) > _STRING_CACHE_SIZE:
+                _STRING_CACHE.popitem(last=False)
+    # the cached items must never be handed out, as callers are free to modify what they get
+    return [_deep_clone(item) for item in cached]
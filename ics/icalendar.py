@@ -83,7 +83,7 @@ class Calendar(CalendarAttrs):
                     raise NotImplementedError(
                         'Multiple calendars in one file are not supported by this method. Use ics.Calendar.parse_multiple()')
 
-                self._populate(containers[0])  # Use first calendar
+                self._populate(containers[0])  # type: ignore  # Use first calendar
 
     @property
     def creator(self) -> str:
@@ -100,7 +100,7 @@ class Calendar(CalendarAttrs):
         and retruns a list of :class:`ics.event.Calendar`
         """
         containers = calendar_string_to_containers(string)
-        return [cls(imports=c) for c in containers]
+        return [cls(imports=c) for c in containers]  # type: ignore
 
     def __repr__(self) -> str:
         return "<Calendar with {} event{} and {} todo{}>" \
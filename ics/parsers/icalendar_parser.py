@@ -1,5 +1,8 @@
+import threading
+from collections import OrderedDict
+from datetime import tzinfo
 from io import StringIO
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, TYPE_CHECKING
 
 from dateutil.tz import tzical
 
@@ -12,6 +15,11 @@ from ics.utils import remove_sequence, remove_x
 if TYPE_CHECKING:
     from ics.icalendar import Calendar
 
+# LRU cache of the timezones parsed by tzical, keyed on the text of their VTIMEZONE block
+_TZICAL_CACHE: "OrderedDict[str, Dict[str, tzinfo]]" = OrderedDict()
+_TZICAL_CACHE_SIZE = 128
+_TZICAL_CACHE_LOCK = threading.Lock()
+
 
 class CalendarParser(Parser):
     @option(required=True)
@@ -57,28 +65,31 @@ class CalendarParser(Parser):
             remove_sequence(
                 vtimezone
             )  # Remove SEQUENCE lines because tzical does not understand them
-            fake_file = StringIO()
-            fake_file.write(str(vtimezone))  # Represent the block as a string
-            fake_file.seek(0)
-            timezones = tzical(fake_file)  # tzical does not like strings
-            # timezones is a tzical object and could contain multiple timezones
-            for key in timezones.keys():
-                calendar._timezones[key] = timezones.get(key)
+            ics_text = str(vtimezone)  # Represent the block as a string
+            with _TZICAL_CACHE_LOCK:
+                timezones = _TZICAL_CACHE.get(ics_text)
+                if timezones is not None:
+                    _TZICAL_CACHE.move_to_end(ics_text)
+            if timezones is None:
+                tzical_timezones = tzical(StringIO(ics_text))  # tzical does not like strings
+                # tzical_timezones is a tzical object and could contain multiple timezones
+                timezones = {key: tzical_timezones.get(key) for key in tzical_timezones.keys()}
+                with _TZICAL_CACHE_LOCK:
+                    _TZICAL_CACHE[ics_text] = timezones
+                    if len(_TZICAL_CACHE) > _TZICAL_CACHE_SIZE:
+                        _TZICAL_CACHE.popitem(last=False)
+            calendar._timezones.update(timezones)
 
     @option(multiple=True)
-    def parse_vevent(calendar: "Calendar", lines: List["ContentLine"]):
+    def parse_vevent(calendar: "Calendar", lines: List["Container"]):
         # tz=calendar._timezones gives access to the event factory to the
         # timezones list
-        def event_factory(x):
-            return Event._from_container(x, tz=calendar._timezones)
-
-        calendar.events = list(map(event_factory, lines))
+        tz = calendar._timezones
+        calendar.events = [Event._from_container(x, tz=tz) for x in lines]
 
     @option(multiple=True)
-    def parse_vtodo(calendar: "Calendar", lines: List["ContentLine"]):
-        # tz=calendar._timezones gives access to the event factory to the
+    def parse_vtodo(calendar: "Calendar", lines: List["Container"]):
+        # tz=calendar._timezones gives access to the todo factory to the
         # timezones list
-        def todo_factory(x):
-            return Todo._from_container(x, tz=calendar._timezones)
-
-        calendar.todos = list(map(todo_factory, lines))
+        tz = calendar._timezones
+        calendar.todos = [Todo._from_container(x, tz=tz) for x in lines]
@@ -25,7 +25,7 @@ class BaseAlarmSerializer(Serializer):
 
     def serialize_repeat(alarm, container):
         if alarm.repeat:
-            container.append(ContentLine("REPEAT", value=alarm.repeat))
+            container.append(ContentLine("REPEAT", value=str(alarm.repeat)))
 
     def serialize_action(alarm, container):
         container.append(ContentLine("ACTION", value=alarm.action))
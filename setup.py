@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import os
 import sys
 
 from setuptools import setup
@@ -32,6 +33,16 @@ class PyTest(TestCommand):
         sys.exit(errno)
 
 
+def ext_modules():
+    # Optionally compile the parser, which is the hot path when reading calendars, to a C extension with mypyc.
+    # The compiled module enforces the type annotations at runtime, e.g. ContentLine values must be strings.
+    if os.environ.get("ICS_USE_MYPYC", "").strip().lower() not in ("1", "true", "yes"):
+        return []
+    from mypyc.build import mypycify
+    # Only type check the compiled module, the rest of the package is imported without being checked.
+    return mypycify(["--follow-imports=silent", "ics/grammar/parse.py"])
+
+
 def readme():
     with open('README.rst', encoding='utf-8') as f:
         return f.read()
@@ -65,6 +76,7 @@ setup(
     install_requires=install_requires,
     license=__license__,
     packages=['ics'],
+    ext_modules=ext_modules(),
     include_package_data=True,
     cmdclass={'test': PyTest},
     tests_require=tests_require,
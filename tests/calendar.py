@@ -25,6 +25,13 @@ class TestCalendar(unittest.TestCase):
         self.assertEqual(c.extra, Container(name='VCALENDAR'))
         self.assertEqual(c._timezones, {})
 
+    def test_timezones_cached(self):
+        c1 = Calendar(cal1)
+        c2 = Calendar(cal1)
+        self.assertTrue(c1._timezones)
+        for key, tz in c1._timezones.items():
+            self.assertIs(tz, c2._timezones[key])
+
     def test_selfload(self):
         def filter(attr, value):
             return not attr.name.startswith("_classmethod") and not attr.name == "_timezones"
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from ics.grammar.parse import ContentLine, ParseError
 from ics.utils import parse_datetime
@@ -29,6 +30,12 @@ class TestContentLine(unittest.TestCase):
             {'TZID': ['Europe/Brussels']},
             '20131029T103000'
         ),
+        'HAHA;p1=a,b;p2=c:hoho':
+        ContentLine(
+            'haha',
+            {'p1': ['a', 'b'], 'p2': ['c']},
+            'hoho'
+        ),
     }
 
     dataset2 = {
@@ -55,12 +62,28 @@ class TestContentLine(unittest.TestCase):
             "DTEND",
             {'TZID': ['UTC']},
             "20190107T000000"
-        )
+        ),
+        'haha;p1=a,"b,c",d;p2="q:;,":v:w':
+        ContentLine(
+            'haha',
+            {'p1': ['a', 'b,c', 'd'], 'p2': ['q:;,']},
+            'v:w'
+        ),
+        'haha;p1=,"":':
+        ContentLine(
+            'haha',
+            {'p1': ['', '']},
+            ''
+        ),
     }
 
     def test_errors(self):
         self.assertRaises(ParseError, ContentLine.parse, 'haha;p1=v1')
         self.assertRaises(ParseError, ContentLine.parse, 'haha;p1:')
+        self.assertRaises(ParseError, ContentLine.parse, 'ha ha:hoho')
+        self.assertRaises(ParseError, ContentLine.parse, 'haha;p1="v1:hoho')
+        self.assertRaises(ParseError, ContentLine.parse, 'haha;p1="v1"v2:hoho')
+        self.assertRaises(ParseError, ContentLine.parse, 'haha:ho\x00ho')
 
     def test_str(self):
         for test in self.dataset:
@@ -75,9 +98,26 @@ class TestContentLine(unittest.TestCase):
             got = ContentLine.parse(test)
             self.assertEqual(expected, got)
 
+    def test_parse_tatsu(self):
+        self.dataset2.update(self.dataset)
+        with mock.patch("ics.grammar.parse.USE_TATSU", True), \
+                mock.patch.dict("ics.grammar.parse._PARSE_CACHE", clear=True):
+            for test in self.dataset2:
+                self.assertEqual(self.dataset2[test], ContentLine.parse(test))
+            self.assertRaises(ParseError, ContentLine.parse, 'haha;p1=v1')
+            self.assertRaises(ParseError, ContentLine.parse, 'ha ha:hoho')
 
     # https://github.com/C4ptainCrunch/ics.py/issues/68
     def test_timezone_not_dropped(self):
         line = ContentLine.parse("DTSTART;TZID=Europe/Berlin:20151104T190000")
         parsed = parse_datetime(line)
         self.assertIn("Europe/Berlin", str(parsed.tzinfo))
+
+    def test_parse_cached(self):
+        line = 'DTSTART;TZID=Europe/Brussels:20131029T103000'
+        first = ContentLine.parse(line)
+        first.params['TZID'].append('Europe/Berlin')
+        first.value = 'changed'
+        second = ContentLine.parse(line)
+        self.assertEqual(self.dataset[line], second)
+        self.assertIsNot(first, second)
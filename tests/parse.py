@@ -1,8 +1,11 @@
+import copy
+import pickle
 import unittest
+from unittest import mock
 
 from ics.icalendar import Calendar
-from ics.grammar.parse import (Container, ContentLine, ParseError, lines_to_container,
-                               string_to_container)
+from ics.grammar.parse import (Container, ContentLine, ParseError, _env_flag, calendar_string_to_containers,
+                               lines_to_container, string_to_container)
 
 from .fixture import cal1, cal5, cal11
 
@@ -29,6 +32,14 @@ class TestParse(unittest.TestCase):
             '20131029T103000'
         ))
 
+    def test_next_line_in_value(self):
+        cal = 'BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nDESCRIPTION:Wait\x85 then\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n'
+        self.assertEqual('Wait\x85 then', string_to_container(cal)[0][0][0].value)
+
+    def test_crlf_lines(self):
+        lines = cal5.replace('\n', '\r\n').split('\n')
+        self.assertEqual(list(map(str, string_to_container(cal5))), list(map(str, lines_to_container(lines))))
+
     def test_many_lines(self):
         i = 0
         for line in string_to_container(cal1)[0]:
@@ -48,6 +59,52 @@ class TestParse(unittest.TestCase):
                     vehicula nullam.', line.value)
             i += 1
 
+    def test_string_cache(self):
+        with mock.patch("ics.grammar.parse.USE_STRING_CACHE", True), \
+                mock.patch.dict("ics.grammar.parse._STRING_CACHE", clear=True):
+            first = calendar_string_to_containers(cal1)
+            first[0][0].value = "changed"
+            first[0][-1].append(ContentLine("X-CHANGED"))
+            second = calendar_string_to_containers(cal1)
+            self.assertEqual(list(map(str, string_to_container(cal1))), list(map(str, second)))
+            self.assertNotEqual(list(map(str, first)), list(map(str, second)))
+
+    def test_deeply_nested(self):
+        depth = 5000
+        lines = ["BEGIN:VCALENDAR"] + ["BEGIN:X-NESTED"] * depth + ["X-LEAF:1"] + ["END:X-NESTED"] * depth + ["END:VCALENDAR"]
+        container = lines_to_container(lines)[0]
+        for i in range(depth):
+            self.assertEqual(1, len(container))
+            container = container[0]
+            self.assertEqual("X-NESTED", container.name)
+        self.assertEqual([ContentLine("X-LEAF", value="1")], list(container))
+
+    def test_deeply_nested_string_cache(self):
+        depth = 5000
+        cal = "\n".join(["BEGIN:VCALENDAR"] + ["BEGIN:X-NESTED"] * depth + ["X-LEAF:1"] +
+                        ["END:X-NESTED"] * depth + ["END:VCALENDAR"])
+        with mock.patch("ics.grammar.parse.USE_STRING_CACHE", True), \
+                mock.patch.dict("ics.grammar.parse._STRING_CACHE", clear=True):
+            for i in range(2):
+                container = calendar_string_to_containers(cal)[0]
+                for j in range(depth):
+                    self.assertEqual(1, len(container))
+                    container = container[0]
+                self.assertEqual([ContentLine("X-LEAF", value="1")], list(container))
+
+    def test_unclosed(self):
+        container = lines_to_container(["BEGIN:VCALENDAR", "BEGIN:VEVENT", "UID:1"])[0]
+        self.assertEqual("VCALENDAR", container.name)
+        self.assertEqual(Container("VEVENT", ContentLine("UID", value="1")), container[0])
+
+    def test_env_flag(self):
+        for value, expected in [("1", True), ("true", True), ("YES", True), ("0", False), ("false", False),
+                                ("no", False), ("", False)]:
+            with mock.patch.dict("os.environ", {"ICS_TEST_FLAG": value}):
+                self.assertEqual(expected, _env_flag("ICS_TEST_FLAG"), value)
+        with mock.patch.dict("os.environ", clear=True):
+            self.assertFalse(_env_flag("ICS_TEST_FLAG"))
+
     def test_end_different(self):
 
         with self.assertRaises(ParseError):
@@ -63,6 +120,38 @@ class TestContainer(unittest.TestCase):
 
         self.assertEqual("<Container 'test' with 1 element>", repr(c))
 
+    def test_check_items(self):
+        c = Container("test", ContentLine(name="VTEST"))
+        c.append(Container("inner"))
+        c.insert(0, ContentLine(name="VFIRST"))
+        c[1] = ContentLine(name="VSECOND")
+        self.assertRaises(TypeError, c.append, "VTEST:cocu")
+        self.assertRaises(TypeError, c.insert, 0, "VTEST:cocu")
+        self.assertRaises(TypeError, c.__setitem__, 0, "VTEST:cocu")
+        self.assertRaises(TypeError, c.extend, [ContentLine(name="VTEST"), "VTEST:cocu"])
+        self.assertRaises(TypeError, Container, "test", "VTEST:cocu")
+        self.assertEqual(["VFIRST", "VSECOND", "inner"], [item.name for item in c])
+
+    def test_from_iterable(self):
+        lines = [ContentLine(name="VTEST%s" % i) for i in range(3)]
+        c = Container.from_iterable("test", (line for line in lines))
+        self.assertEqual(Container("test", *lines), c)
+        self.assertEqual("test", c.name)
+        self.assertRaises(TypeError, Container.from_iterable, "test", [lines[0], "VTEST:cocu"])
+
+    def test_clone(self):
+        c = Container("test", ContentLine(name="VTEST"))
+        clone = c.clone()
+        self.assertEqual(c, clone)
+        self.assertEqual(c.name, clone.name)
+        clone.append(ContentLine(name="VOTHER"))
+        self.assertEqual(1, len(c))
+
+    def test_str_nested(self):
+        inner = Container("VEVENT", ContentLine("UID", value="1"))
+        c = Container("VCALENDAR", ContentLine("VERSION", value="2.0"), inner)
+        self.assertEqual("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\nUID:1\r\nEND:VEVENT\r\nEND:VCALENDAR", str(c))
+
 
 class TestLine(unittest.TestCase):
 
@@ -72,5 +161,36 @@ class TestLine(unittest.TestCase):
         self.assertEqual("<ContentLine 'VTEST' with 0 parameter. Value='cocu !'>", repr(c))
 
     def test_get_item(self):
-        l = ContentLine(name="VTEST", value="cocu !", params={"plop": "plip"})
-        self.assertEqual(l['plop'], "plip")
+        l = ContentLine(name="VTEST", value="cocu !", params={"plop": ["plip"]})
+        self.assertEqual(l['plop'], ["plip"])
+
+    def test_types(self):
+        import ics.grammar.parse
+        if ics.grammar.parse.__file__.endswith(".py"):
+            self.assertEqual(ContentLine("VTEST", value=3).value, 3)
+            self.assertEqual(ContentLine("VTEST", params={"plop": "plip"})["plop"], "plip")
+        else:
+            # the module was compiled with mypyc, which enforces the annotated types at runtime
+            with self.assertRaises(TypeError):
+                ContentLine("VTEST", value=3)
+            with self.assertRaises(TypeError):
+                ContentLine("VTEST", params={"plop": "plip"})["plop"]
+
+    def test_clone(self):
+        l = ContentLine(name="VTEST", value="cocu !", params={"plop": ["plip"]})
+        c = l.clone()
+        self.assertEqual(l, c)
+        self.assertIsNot(l, c)
+        c.params["plip"] = ["plop"]
+        self.assertNotIn("plip", l.params)
+
+    def test_copy(self):
+        l = ContentLine(name="VTEST", value="cocu !", params={"plop": ["plip"]})
+        self.assertEqual(l, copy.copy(l))
+        self.assertEqual(l, copy.deepcopy(l))
+        self.assertEqual(l, pickle.loads(pickle.dumps(l)))
+
+    def test_equality(self):
+        self.assertEqual(ContentLine("vtest", {}, "a"), ContentLine("VTEST", value="a"))
+        self.assertNotEqual(ContentLine("VTEST", value="a"), ContentLine("VTEST", value="b"))
+        self.assertNotEqual(ContentLine("VTEST", value="a"), "VTEST:a")
@@ -1,6 +1,6 @@
 import unittest
 
-from ics.grammar.parse import unfold_lines
+from ics.grammar.parse import ParseError, unfold_lines, unfold_text
 
 from .fixture import (cal1, cal2, cal3, cal6, cal7, cal8, cal9, cal26,
                       unfolded_cal1, unfolded_cal2, unfolded_cal6,
@@ -42,6 +42,14 @@ class TestUnfoldLines(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(list(unfold_lines([])), [])
 
+    def test_crlf(self):
+        self.assertEqual(list(unfold_lines(cal1.replace('\n', '\r\n').split('\n'))), unfolded_cal1)
+        self.assertEqual(list(unfold_lines('a\r\n b\r\n\r\nc\r'.split('\n'))), ['ab', 'c'])
+
+    def test_not_iterable(self):
+        with self.assertRaises(ParseError):
+            list(unfold_lines(None))
+
     def test_one_line(self):
         self.assertEqual(list(unfold_lines(cal6.split('\n'))), unfolded_cal6)
 
@@ -60,3 +68,34 @@ class TestUnfoldLines(unittest.TestCase):
     def test_first_line_empty(self):
         self.assertEqual(list(unfold_lines(cal9.split('\n'))),
                          ['BEGIN:VCALENDAR', 'END:VCALENDAR'])
+
+
+class TestUnfoldText(unittest.TestCase):
+
+    def test_same_as_unfold_lines(self):
+        for cal in (cal1, cal2, cal3, cal6, cal7, cal8, cal9, cal26):
+            self.assertEqual(unfold_text(cal), list(unfold_lines(cal.splitlines())))
+
+    def test_crlf(self):
+        self.assertEqual(unfold_text('a\r\n b\r\nc\r\n\td\r\n'), ['ab', 'cd'])
+
+    def test_only_crlf_breaks_lines(self):
+        self.assertEqual(unfold_text('a\x85 b\u2028c\x0cd\r\n e\rf'), ['a\x85 b\u2028c\x0cde', 'f'])
+
+    def test_unicode_blank_lines(self):
+        text = 'a\n\u3000\n b\n\xa0\x85\nc\n \u2029'
+        self.assertEqual(unfold_text(text), ['ab', 'c'])
+        self.assertEqual(unfold_text(text), list(unfold_lines(text.split('\n'))))
+
+    def test_simple(self):
+        dataset = {
+            'a': ['a'],
+            'a\n b': ['ab'],
+            'a \n b': ['a b'],
+            'a\n b\nc': ['ab', 'c'],
+            'a\n b\n c': ['abc'],
+            'a\n\n b': ['ab'],
+            'a\n\n \nb': ['a', 'b'],
+        }
+        for text in dataset:
+            self.assertEqual(dataset[text], unfold_text(text))